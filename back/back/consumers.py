@@ -1,6 +1,18 @@
 from channels.generic.websocket import AsyncWebsocketConsumer
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj):
+    # 进度消息发送频繁，有 orjson 时用它序列化
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
 class ProgressConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.task_id = self.scope['url_route']['kwargs']['task_id']
@@ -51,6 +63,6 @@ class ProgressConsumer(AsyncWebsocketConsumer):
 
     async def progress_update(self, event):
         # 发送进度到客户端
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=dumps({
             'progress': event['progress']
         }))
@@ -36,6 +36,11 @@ ALLOWED_HOSTS = [
 # Application definition
 MEDIA_URL = '/media/'  # 访问文件的 URL 前缀
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# 大文件上传的临时目录与 MEDIA_ROOT 放在同一文件系统下，保存模型时 Django 直接 rename 而不是再复制一遍；
+# 放在 MEDIA_ROOT 之外，未上传完的文件不会通过 MEDIA_URL 被访问到。目录在 BlogsConfig.ready() 中创建
+FILE_UPLOAD_TEMP_DIR = os.path.join(BASE_DIR, 'upload_tmp')
+# 译文下载走 nginx 时设置为 internal location 的前缀（如 /protected/），由 nginx 通过 X-Accel-Redirect 直接发送文件
+DOWNLOAD_ACCEL_REDIRECT_PREFIX = os.environ.get('DOWNLOAD_ACCEL_REDIRECT_PREFIX', '')
 
 INSTALLED_APPS = [
     'channels',
@@ -71,6 +76,13 @@ CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
+# 翻译任务耗时长：每个 worker 进程只预取一个任务，避免排在长任务后面；
+# 任务完成后才确认，worker 崩溃时任务会重新入队
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+# Redis 在可见性超时后会重新投递未确认的任务，需要大于最长的翻译耗时
+CELERY_BROKER_TRANSPORT_OPTIONS = {'visibility_timeout': 6 * 60 * 60}
 
 # Channels 配置
 WSGI_APPLICATION = "back.wsgi.application"
@@ -158,3 +170,28 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# 日志配置：blogs 应用的日志输出到控制台，级别可用环境变量调整
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {
+            'format': '[{asctime}] {levelname} {name}: {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'simple',
+        },
+    },
+    'loggers': {
+        'blogs': {
+            'handlers': ['console'],
+            'level': os.environ.get('BLOGS_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
@@ -1 +1,7 @@
-from .pdf2zh.api import aipdf
\ No newline at end of file
+def __getattr__(name):
+    # 按需导入 pdf2zh：只用到 babeldoc 里轻量模块（如 fsutils）时不加载整套翻译依赖
+    if name == "aipdf":
+        from .pdf2zh.api import aipdf
+
+        return aipdf
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -21,12 +21,43 @@ from babeldoc.document_il.utils.layout_helper import is_same_style
 from babeldoc.translation_config import TranslationConfig
 
 
+# 排除在外的正文字体
+_NON_FORMULAR_FONT_PATTERN = r"^(Cambria|Cambria-BoldItalic|Cambria-Bold|Cambria-Italic|EUAlbertina.+|NimbusRomNo9L.+|GlosaMath.+)$"
+_NON_FORMULAR_FONT_RE = re.compile(_NON_FORMULAR_FONT_PATTERN)
+_NON_FORMULAR_FONT_BYTES_RE = re.compile(_NON_FORMULAR_FONT_PATTERN.encode())
+_DEFAULT_FORMULAR_FONT_RE = re.compile(
+    r"(CM[^RB]"
+    r"|(MS|XY|MT|BL|RM|EU|LA|RS)[A-Z]"
+    r"|LINE"
+    r"|LCIRCLE"
+    r"|TeX-"
+    r"|rsfs"
+    r"|txsy"
+    r"|wasy"
+    r"|stmary"
+    r"|.*Mono"
+    r"|.*Code"
+    r"|.*Ital"
+    r"|.*Sym"
+    r"|.*Math"
+    r")"
+)
+_FORMULAR_CHAR_RE = re.compile("[0-9\\[\\]•]")
+_TRANSLATABLE_FORMULA_RE = re.compile(r"^[0-9, ]+$")
+
+
 class StylesAndFormulas:
     stage_name = "Parse Formulas and Styles"
 
     def __init__(self, translation_config: TranslationConfig):
         self.translation_config = translation_config
         self.font_mapper = FontMapper(translation_config)
+        self.formular_font_regex = (
+            translation_config.formular_font_regex or _DEFAULT_FORMULAR_FONT_RE
+        )
+        # BASE64: 字体名是 bytes，第一次遇到时再编译对应的 bytes 正则
+        self._formular_font_bytes_regex = None
+        self.formular_char_regex = translation_config.formular_char_regex
 
     def process(self, document: Document):
         with self.translation_config.progress_monitor.stage_start(
@@ -476,42 +507,26 @@ class StylesAndFormulas:
         text = "".join(char.char_unicode for char in formula.pdf_character)
         if formula.y_offset > 0.1:
             return False
-        return bool(re.match(r"^[0-9, ]+$", text))
+        return bool(_TRANSLATABLE_FORMULA_RE.match(text))
 
     def is_formulas_font(self, font_name: str) -> bool:
-        pattern2 = r"^(Cambria|Cambria-BoldItalic|Cambria-Bold|Cambria-Italic|EUAlbertina.+|NimbusRomNo9L.+|GlosaMath.+)$"
-        if self.translation_config.formular_font_pattern:
-            pattern = self.translation_config.formular_font_pattern
-        else:
-            pattern = (
-                r"(CM[^RB]"
-                r"|(MS|XY|MT|BL|RM|EU|LA|RS)[A-Z]"
-                r"|LINE"
-                r"|LCIRCLE"
-                r"|TeX-"
-                r"|rsfs"
-                r"|txsy"
-                r"|wasy"
-                r"|stmary"
-                r"|.*Mono"
-                r"|.*Code"
-                r"|.*Ital"
-                r"|.*Sym"
-                r"|.*Math"
-                r")"
-            )
-
         if font_name.startswith("BASE64:"):
             font_name_bytes = base64.b64decode(font_name[7:])
             font = font_name_bytes.split(b"+")[-1]
-            pattern2 = pattern2.encode()
-            pattern = pattern.encode()
+            non_formular_regex = _NON_FORMULAR_FONT_BYTES_RE
+            if self._formular_font_bytes_regex is None:
+                self._formular_font_bytes_regex = re.compile(
+                    self.formular_font_regex.pattern.encode()
+                )
+            formular_regex = self._formular_font_bytes_regex
         else:
             font = font_name.split("+")[-1]
+            non_formular_regex = _NON_FORMULAR_FONT_RE
+            formular_regex = self.formular_font_regex
 
-        if re.match(pattern2, font):
+        if non_formular_regex.match(font):
             return False
-        if re.match(pattern, font):
+        if formular_regex.match(font):
             return True
 
         return False
@@ -521,9 +536,8 @@ class StylesAndFormulas:
             return True
         if not self.font_mapper.has_char(char):
             return True
-        if self.translation_config.formular_char_pattern:
-            pattern = self.translation_config.formular_char_pattern
-            if re.match(pattern, char):
+        if self.formular_char_regex is not None:
+            if self.formular_char_regex.match(char):
                 return True
         if (
             char
@@ -545,7 +559,7 @@ class StylesAndFormulas:
             )
         ):
             return True
-        if re.match("[0-9\\[\\]•]", char):
+        if _FORMULAR_CHAR_RE.match(char):
             return True
         return False
 
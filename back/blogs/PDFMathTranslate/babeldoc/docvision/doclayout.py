@@ -1,6 +1,7 @@
 import abc
 import ast
 import logging
+import os
 import platform
 from collections.abc import Generator
 
@@ -33,9 +34,11 @@ class YoloResult:
 
 class DocLayoutModel(abc.ABC):
     @staticmethod
-    def load_onnx():
+    def load_onnx(intra_op_num_threads: int | None = None):
         logger.info("Loading ONNX model...")
-        model = OnnxModel.from_pretrained()
+        model = OnnxModel.from_pretrained(
+            session_options=create_session_options(intra_op_num_threads)
+        )
         return model
 
     @staticmethod
@@ -112,8 +115,32 @@ else:
 providers.append("CPUExecutionProvider")  # CPU 执行提供者作为通用后备选项
 
 
+def create_session_options(
+    intra_op_num_threads: int | None = None,
+) -> onnxruntime.SessionOptions:
+    """Build the ONNX Runtime session options for the layout model.
+
+    Args:
+        intra_op_num_threads: Threads used inside a single operator. Defaults to
+            half of the CPU count so inference doesn't oversubscribe the cores
+            shared with the translation worker threads.
+    """
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = (
+        onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    )
+    if intra_op_num_threads is None:
+        intra_op_num_threads = max(1, (os.cpu_count() or 1) // 2)
+    options.intra_op_num_threads = intra_op_num_threads
+    return options
+
+
 class OnnxModel(DocLayoutModel):
-    def __init__(self, model_path: str):
+    def __init__(
+        self,
+        model_path: str,
+        session_options: onnxruntime.SessionOptions | None = None,
+    ):
         self.model_path = model_path
 
         model = onnx.load(model_path)
@@ -123,13 +150,14 @@ class OnnxModel(DocLayoutModel):
 
         self.model = onnxruntime.InferenceSession(
             model.SerializeToString(),
+            sess_options=session_options,
             providers=providers,
         )
 
     @staticmethod
-    def from_pretrained():
+    def from_pretrained(session_options: onnxruntime.SessionOptions | None = None):
         pth = get_doclayout_onnx_model_path()
-        return OnnxModel(pth)
+        return OnnxModel(pth, session_options=session_options)
 
     @property
     def stride(self):
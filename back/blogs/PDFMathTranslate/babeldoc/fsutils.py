@@ -0,0 +1,23 @@
+import os
+from pathlib import Path
+
+# 本进程内已经确认存在的目录
+_ensured_dirs: set[str] = set()
+
+
+def ensure_dir(path: str | Path) -> None:
+    """Create a directory (and its parents) unless this process already did.
+
+    The common case of an existing directory costs a single mkdir call.
+    """
+    key = os.fspath(path)
+    if key in _ensured_dirs:
+        return
+    try:
+        os.mkdir(key)
+    except FileExistsError:
+        if not os.path.isdir(key):
+            raise
+    except FileNotFoundError:
+        Path(key).mkdir(parents=True, exist_ok=True)
+    _ensured_dirs.add(key)
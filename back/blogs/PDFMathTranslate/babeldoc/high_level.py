@@ -3,6 +3,7 @@ import copy
 import hashlib
 import io
 import logging
+import mmap
 import pathlib
 import threading
 import time
@@ -60,6 +61,10 @@ TRANSLATE_STAGES = [
     (SAVE_PDF_STAGE_NAME, 2.45),  # Save PDF
 ]
 
+# Pages larger than this (in PDF points) are skipped
+MAX_PAGE_HEIGHT = 1200
+MAX_PAGE_WIDTH = 2000
+
 resfont_map = {
     "zh-cn": "china-ss",
     "zh-tw": "china-ts",
@@ -81,6 +86,20 @@ def verify_file_hash(file_path: str, expected_hash: str) -> bool:
     return sha256_hash.hexdigest() == expected_hash
 
 
+def _open_parser_source(inf: BinaryIO):
+    """Map the input file into memory for pdfminer when possible.
+
+    The interpreter needs pdfminer's own object model (resources and content
+    streams), so the document is parsed a second time next to ``doc_zh``.
+    Backing that parse with an mmap turns its many small seek/read calls into
+    memory accesses on the already warm page cache.
+    """
+    try:
+        return mmap.mmap(inf.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return None
+
+
 def start_parse_il(
     inf: BinaryIO,
     pages: list[int] | None = None,
@@ -129,6 +148,33 @@ def start_parse_il(
 
     il_creater.on_total_pages(total_pages)
 
+    source = _open_parser_source(inf)
+    try:
+        _parse_pages(
+            source if source is not None else inf,
+            pages,
+            doc_zh,
+            interpreter,
+            cancellation_event,
+            il_creater,
+            translation_config,
+        )
+    finally:
+        if source is not None:
+            source.close()
+    il_creater.on_finish()
+    device.close()
+
+
+def _parse_pages(
+    inf,
+    pages: list[int] | None,
+    doc_zh: Document,
+    interpreter: PDFPageInterpreterEx,
+    cancellation_event: asyncio.Event | None,
+    il_creater: ILCreater,
+    translation_config: TranslationConfig,
+) -> None:
     parser = PDFParser(inf)
     doc = PDFDocument(parser)
 
@@ -142,11 +188,10 @@ def start_parse_il(
         if not translation_config.should_translate_page(pageno + 1):
             continue
 
-        height, width = (
-            page.cropbox[3] - page.cropbox[1],
-            page.cropbox[2] - page.cropbox[0],
-        )
-        if height > 1200 or width > 2000:
+        cropbox = page.cropbox
+        height = cropbox[3] - cropbox[1]
+        width = cropbox[2] - cropbox[0]
+        if height > MAX_PAGE_HEIGHT or width > MAX_PAGE_WIDTH:
             logger.warning(f"page {pageno + 1} is too large, skip")
             continue
 
@@ -195,8 +240,6 @@ def start_parse_il(
         ops_base = interpreter.process_page(page)
         il_creater.on_page_base_operation(ops_base)
         il_creater.on_page_end()
-    il_creater.on_finish()
-    device.close()
 
 
 def translate(translation_config: TranslationConfig) -> TranslateResult:
@@ -1,34 +1,36 @@
+import argparse
 import asyncio
+import contextlib
+import dataclasses
+import functools
 import logging
+import os
+import stat
+import sys
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 from typing import Any
 
 import configargparse
-import tqdm
-from rich.progress import BarColumn
-from rich.progress import MofNCompleteColumn
-from rich.progress import Progress
-from rich.progress import TextColumn
-from rich.progress import TimeElapsedColumn
-from rich.progress import TimeRemainingColumn
-
-import babeldoc.assets.assets
-import babeldoc.high_level
-from babeldoc.document_il.translator.translator import BingTranslator
-from babeldoc.document_il.translator.translator import GoogleTranslator
-from babeldoc.document_il.translator.translator import OpenAITranslator
-from babeldoc.document_il.translator.translator import TranslateTranslator
-from babeldoc.document_il.translator.translator import set_translate_rate_limiter
-from babeldoc.docvision.doclayout import DocLayoutModel
-from babeldoc.docvision.rpc_doclayout import RpcDocLayoutModel
-from babeldoc.translation_config import TranslationConfig
-from babeldoc.translation_config import WatermarkOutputMode
+
+# Translators, the layout model, babeldoc.high_level and the progress bar
+# libraries are imported where they are used so that trivial invocations
+# (--version, --help, --warmup) don't pay for loading them.
+if TYPE_CHECKING:
+    from babeldoc.translation_config import TranslationConfig
 
 logger = logging.getLogger(__name__)
 __version__ = "0.1.31"
 
+# Third-party loggers that are too chatty for the CLI
+SILENCED_LOGGERS = ("pdfminer", "peewee", "httpx", "httpcore", "openai", "http11")
+
 
+@functools.cache
 def create_parser():
+    # The parser only holds argument definitions; parse_args() doesn't mutate
+    # it, so one instance is shared by every invocation in the process.
     parser = configargparse.ArgParser(
         config_file_parser_class=configargparse.TomlConfigParser(["babeldoc"]),
     )
@@ -62,6 +64,12 @@ def create_parser():
         "--rpc-doclayout",
         help="RPC service host address for document layout analysis",
     )
+    parser.add_argument(
+        "--onnx-threads",
+        type=int,
+        default=None,
+        help="Intra-op thread count of the ONNX layout model (default: half of the CPU cores)",
+    )
     parser.add_argument(
         "--generate-offline-assets",
         default=None,
@@ -183,6 +191,12 @@ def create_parser():
         action="store_true",
         help="[DEPRECATED] Use --watermark-output-mode=no_watermark instead. Do not add watermark to the translated PDF.",
     )
+    translation_group.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of PDF files translated concurrently (default: 1)",
+    )
     translation_group.add_argument(
         "--report-interval",
         type=float,
@@ -241,14 +255,31 @@ def create_parser():
     return parser
 
 
+@functools.cache
+def _frozen_args_type(fields: tuple[str, ...]) -> type:
+    return dataclasses.make_dataclass("CLIArgs", fields, frozen=True, slots=True)
+
+
+def freeze_args(args: argparse.Namespace):
+    """Copy a parsed Namespace into a frozen, slotted dataclass instance.
+
+    Slot access is cheaper than Namespace's __dict__ lookups in the per-file
+    code, and accidental writes to the parsed arguments raise immediately.
+    """
+    values = vars(args)
+    return _frozen_args_type(tuple(values))(**values)
+
+
 async def main():
     parser = create_parser()
-    args: Any = parser.parse_args()
+    args: Any = freeze_args(parser.parse_args())
 
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
 
     if args.generate_offline_assets:
+        import babeldoc.assets.assets
+
         babeldoc.assets.assets.generate_offline_assets_package(
             Path(args.generate_offline_assets)
         )
@@ -256,6 +287,8 @@ async def main():
         return
 
     if args.restore_offline_assets:
+        import babeldoc.assets.assets
+
         babeldoc.assets.assets.restore_offline_assets_package(
             Path(args.restore_offline_assets)
         )
@@ -263,6 +296,8 @@ async def main():
         return
 
     if args.warmup:
+        import babeldoc.assets.assets
+
         babeldoc.assets.assets.warmup()
         logger.info("Warmup completed, exiting...")
         return
@@ -275,8 +310,53 @@ async def main():
     if args.openai and not args.openai_api_key:
         parser.error("使用 OpenAI 服务时必须提供 API key")
 
+    # 在加载翻译器和布局模型之前完成所有校验，尽早报错
+    # 清理文件路径，去除 --files= 前缀和两端的引号，只做一次
+    pending_files = [
+        file.removeprefix("--files=").lstrip("-").strip("\"'") for file in args.files
+    ]
+    for file in pending_files:
+        # 一次 stat 同时校验存在性和是否为普通文件
+        try:
+            file_stat = os.stat(file)
+        except OSError:
+            logger.error(f"文件不存在：{file}")
+            exit(1)
+        if not stat.S_ISREG(file_stat.st_mode) or not file.lower().endswith(".pdf"):
+            logger.error(f"文件不是 PDF 文件：{file}")
+            exit(1)
+
+    output_dir = Path(args.output) if args.output else None
+    if output_dir is not None and not output_dir.exists():
+        logger.info(f"输出目录不存在，创建：{output_dir}")
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            logger.critical(
+                f"Failed to create output folder at {output_dir}",
+                exc_info=True,
+            )
+            exit(1)
+
+    # 到这里才真正开始翻译：此前的 --version/--help/--warmup 等分支不需要加载
+    # high_level 背后的整套翻译依赖
+    import babeldoc.high_level
+
+    babeldoc.high_level.init()
+
+    from babeldoc.translation_config import WatermarkOutputMode
+
+    # --watermark-output-mode 的 choices 与枚举值一一对应
+    watermark_output_mode = (
+        WatermarkOutputMode.NoWatermark
+        if args.no_watermark
+        else WatermarkOutputMode(args.watermark_output_mode)
+    )
+
     # 实例化翻译器
     if args.openai:
+        from babeldoc.document_il.translator.translator import OpenAITranslator
+
         translator = OpenAITranslator(
             lang_in=args.lang_in,
             lang_out=args.lang_out,
@@ -286,12 +366,16 @@ async def main():
             ignore_cache=args.ignore_cache,
         )
     elif args.bing:
+        from babeldoc.document_il.translator.translator import BingTranslator
+
         translator = BingTranslator(
             lang_in=args.lang_in,
             lang_out=args.lang_out,
             ignore_cache=args.ignore_cache,
         )
     elif args.translate:
+        from babeldoc.document_il.translator.translator import TranslateTranslator
+
         translator = TranslateTranslator(
             lang_in=args.lang_in,
             lang_out=args.lang_out,
@@ -299,6 +383,8 @@ async def main():
             url=args.translate_url,
         )
     else:
+        from babeldoc.document_il.translator.translator import GoogleTranslator
+
         translator = GoogleTranslator(
             lang_in=args.lang_in,
             lang_out=args.lang_out,
@@ -306,103 +392,196 @@ async def main():
         )
 
     # 设置翻译速率限制
+    from babeldoc.document_il.translator.translator import set_translate_rate_limiter
+
     set_translate_rate_limiter(args.qps)
 
-    # 初始化文档布局模型
+    # 初始化文档布局模型，所有文件共用同一个模型实例（同一个 ONNX session）
     if args.rpc_doclayout:
+        from babeldoc.docvision.rpc_doclayout import RpcDocLayoutModel
+
         doc_layout_model = RpcDocLayoutModel(host=args.rpc_doclayout)
     else:
-        doc_layout_model = DocLayoutModel.load_onnx()
-
-    pending_files = []
-    for file in args.files:
-        # 清理文件路径，去除两端的引号
-        if file.startswith("--files="):
-            file = file[len("--files=") :]
-        file = file.lstrip("-").strip("\"'")
-        if not Path(file).exists():
-            logger.error(f"文件不存在：{file}")
-            exit(1)
-        if not file.endswith(".pdf"):
-            logger.error(f"文件不是 PDF 文件：{file}")
-            exit(1)
-        pending_files.append(file)
-
-    if args.output:
-        if not Path(args.output).exists():
-            logger.info(f"输出目录不存在，创建：{args.output}")
-            try:
-                Path(args.output).mkdir(parents=True, exist_ok=True)
-            except OSError:
-                logger.critical(
-                    f"Failed to create output folder at {args.output}",
-                    exc_info=True,
-                )
-                exit(1)
-    else:
-        args.output = None
-
-    watermark_output_mode = WatermarkOutputMode.Watermarked
-    if args.no_watermark:
-        watermark_output_mode = WatermarkOutputMode.NoWatermark
-    elif args.watermark_output_mode == "both":
-        watermark_output_mode = WatermarkOutputMode.Both
-    elif args.watermark_output_mode == "watermarked":
-        watermark_output_mode = WatermarkOutputMode.Watermarked
-    elif args.watermark_output_mode == "no_watermark":
-        watermark_output_mode = WatermarkOutputMode.NoWatermark
+        from babeldoc.docvision.doclayout import DocLayoutModel
 
-    for file in pending_files:
-        # 清理文件路径，去除两端的引号
-        file = file.strip("\"'")
-        # 创建配置对象
-        config = TranslationConfig(
-            input_file=file,
-            font=None,
-            pages=args.pages,
-            output_dir=args.output,
-            translator=translator,
-            debug=args.debug,
-            lang_in=args.lang_in,
-            lang_out=args.lang_out,
-            no_dual=args.no_dual,
-            no_mono=args.no_mono,
-            qps=args.qps,
-            formular_font_pattern=args.formular_font_pattern,
-            formular_char_pattern=args.formular_char_pattern,
-            split_short_lines=args.split_short_lines,
-            short_line_split_factor=args.short_line_split_factor,
-            doc_layout_model=doc_layout_model,
-            skip_clean=args.skip_clean,
-            dual_translate_first=args.dual_translate_first,
-            disable_rich_text_translate=args.disable_rich_text_translate,
-            enhance_compatibility=args.enhance_compatibility,
-            use_alternating_pages_dual=args.use_alternating_pages_dual,
-            report_interval=args.report_interval,
-            min_text_length=args.min_text_length,
-            watermark_output_mode=watermark_output_mode,
+        doc_layout_model = DocLayoutModel.load_onnx(
+            intra_op_num_threads=args.onnx_threads
         )
 
-        # Create progress handler
-        progress_context, progress_handler = create_progress_handler(config)
+    from babeldoc.translation_config import TranslationConfig
+
+    # 除 input_file 外，所有文件共用同一组配置参数
+    base_kwargs = dict(
+        font=None,
+        pages=args.pages,
+        output_dir=output_dir,
+        translator=translator,
+        debug=args.debug,
+        lang_in=args.lang_in,
+        lang_out=args.lang_out,
+        no_dual=args.no_dual,
+        no_mono=args.no_mono,
+        qps=args.qps,
+        formular_font_pattern=args.formular_font_pattern,
+        formular_char_pattern=args.formular_char_pattern,
+        split_short_lines=args.split_short_lines,
+        short_line_split_factor=args.short_line_split_factor,
+        doc_layout_model=doc_layout_model,
+        skip_clean=args.skip_clean,
+        dual_translate_first=args.dual_translate_first,
+        disable_rich_text_translate=args.disable_rich_text_translate,
+        enhance_compatibility=args.enhance_compatibility,
+        use_alternating_pages_dual=args.use_alternating_pages_dual,
+        report_interval=args.report_interval,
+        min_text_length=args.min_text_length,
+        watermark_output_mode=watermark_output_mode,
+    )
+
+    if args.concurrency <= 1:
+        for file in pending_files:
+            # 创建配置对象
+            config = TranslationConfig(input_file=file, **base_kwargs)
+            progress_context, progress_handler = create_progress_handler(config)
+            with progress_context:
+                await translate_with_progress(config, progress_handler)
+        return
 
-        # 开始翻译
-        with progress_context:
-            async for event in babeldoc.high_level.async_translate(config):
-                progress_handler(event)
-                if config.debug:
-                    logger.debug(event)
-                if event["type"] == "finish":
-                    result = event["translate_result"]
-                    logger.info(str(result))
-                    break
+    # 并发翻译多个文件；出站请求仍由 set_translate_rate_limiter 统一限速。
+    # rich 同一时间只允许一个实时显示，因此启用 rich 进度条时所有文件共用一个 Progress。
+    if base_kwargs.get("use_rich_pbar", True):
+        shared_progress = create_rich_progress()
+        shared_progress_context = shared_progress
+    else:
+        shared_progress = None
+        shared_progress_context = contextlib.nullcontext()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def translate_one(index, file):
+        async with semaphore:
+            kwargs = base_kwargs
+            if args.debug:
+                from babeldoc.const import CACHE_FOLDER
+
+                # 调试模式下保留中间文件；并发时每个任务用自己的工作目录，
+                # 避免同名文件互相覆盖
+                kwargs = dict(
+                    base_kwargs,
+                    working_dir=Path(CACHE_FOLDER)
+                    / "working"
+                    / f"{Path(file).stem}-{index}",
+                )
+            config = TranslationConfig(input_file=file, **kwargs)
+            progress_context, progress_handler = create_progress_handler(
+                config, shared_progress=shared_progress
+            )
+            with progress_context:
+                await translate_with_progress(config, progress_handler)
+
+    with shared_progress_context:
+        await asyncio.gather(
+            *(translate_one(index, file) for index, file in enumerate(pending_files))
+        )
 
 
-def create_progress_handler(translation_config: TranslationConfig):
+async def translate_with_progress(config: "TranslationConfig", progress_handler):
+    import babeldoc.high_level
+
+    # 进度事件交给独立任务处理，避免终端渲染阻塞事件消费
+    queue = asyncio.Queue(maxsize=256)
+    ui_task = asyncio.create_task(drain_progress_events(queue, progress_handler))
+    try:
+        async for event in babeldoc.high_level.async_translate(config):
+            await put_progress_event(queue, ui_task, event)
+            if config.debug and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%r", event)
+            if event["type"] == "finish":
+                result = event["translate_result"]
+                logger.info(str(result))
+                break
+    except BaseException:
+        # 出错或被取消时不再等待进度处理任务消费剩余事件
+        ui_task.cancel()
+        await asyncio.wait({ui_task})
+        if not ui_task.cancelled():
+            ui_task.exception()
+        raise
+    await put_progress_event(queue, ui_task, None)
+    await ui_task
+
+
+async def put_progress_event(queue: asyncio.Queue, ui_task: asyncio.Task, event):
+    """Queue an event for drain_progress_events without outliving it.
+
+    If the handler task has died, its exception is raised here instead of
+    blocking forever on a full queue that nothing reads any more.
+    """
+    if not ui_task.done():
+        if not queue.full():
+            queue.put_nowait(event)
+            return
+        put = asyncio.ensure_future(queue.put(event))
+        try:
+            await asyncio.wait({put, ui_task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if not put.done():
+                put.cancel()
+        if put.done() and not put.cancelled():
+            return
+    ui_task.result()
+
+
+async def drain_progress_events(queue: asyncio.Queue, progress_handler):
+    """Feed queued progress events to progress_handler until a None sentinel.
+
+    Events that piled up while the handler was rendering are processed as a
+    batch, and consecutive progress_update events of the same stage are
+    collapsed into the latest one since only that one would be visible.
+    """
+    while True:
+        batch = [await queue.get()]
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        for event, next_event in zip(batch, batch[1:] + [None]):
+            if event is None:
+                return
+            if (
+                next_event is not None
+                and event["type"] == "progress_update"
+                and next_event["type"] == "progress_update"
+                and event["stage"] == next_event["stage"]
+            ):
+                continue
+            progress_handler(event)
+
+
+def create_rich_progress():
+    from rich.progress import BarColumn
+    from rich.progress import MofNCompleteColumn
+    from rich.progress import Progress
+    from rich.progress import TextColumn
+    from rich.progress import TimeElapsedColumn
+    from rich.progress import TimeRemainingColumn
+
+    return Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeElapsedColumn(),
+        TimeRemainingColumn(),
+    )
+
+
+def create_progress_handler(
+    translation_config: "TranslationConfig",
+    shared_progress=None,
+):
     """Create a progress handler function based on the configuration.
 
     Args:
         translation_config: The translation configuration.
+        shared_progress: A rich Progress shared by several concurrent
+            translations. Its tasks are labelled with the input file name and
+            the caller is responsible for entering it.
 
     Returns:
         A tuple of (progress_context, progress_handler), where progress_context is a context
@@ -410,78 +589,129 @@ def create_progress_handler(translation_config: TranslationConfig):
         is a function that will be called with progress events.
     """
     if translation_config.use_rich_pbar:
-        progress = Progress(
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            MofNCompleteColumn(),
-            TimeElapsedColumn(),
-            TimeRemainingColumn(),
-        )
-        translate_task_id = progress.add_task("translate", total=100)
+        if shared_progress is not None:
+            progress = shared_progress
+            progress_context = contextlib.nullcontext()
+            label = f"{Path(translation_config.input_file).name}: "
+        else:
+            progress = create_rich_progress()
+            progress_context = progress
+            label = ""
+        translate_task_id = progress.add_task(f"{label}translate", total=100)
         stage_tasks = {}
-
-        def progress_handler(event):
-            if event["type"] == "progress_start":
-                stage_tasks[event["stage"]] = progress.add_task(
-                    f"{event['stage']}",
-                    total=event.get("stage_total", 100),
+        update = progress.update
+        # Rich re-renders on its own refresh thread, so forced refreshes from
+        # progress_update are limited to one per report interval.
+        interval = translation_config.report_interval
+        last_refresh = 0.0
+
+        def on_start(event):
+            stage = event["stage"]
+            stage_tasks[stage] = progress.add_task(
+                f"{label}{stage}",
+                total=event.get("stage_total", 100),
+            )
+
+        def on_update(event):
+            nonlocal last_refresh
+            now = time.monotonic()
+            refresh = now - last_refresh >= interval
+            if refresh:
+                last_refresh = now
+            stage = event["stage"]
+            task_id = stage_tasks.get(stage)
+            if task_id is not None:
+                update(
+                    task_id,
+                    completed=event["stage_current"],
+                    total=event["stage_total"],
+                    description=f"{label}{stage}",
+                    refresh=refresh,
                 )
-            elif event["type"] == "progress_update":
-                stage = event["stage"]
-                if stage in stage_tasks:
-                    progress.update(
-                        stage_tasks[stage],
-                        completed=event["stage_current"],
-                        total=event["stage_total"],
-                        description=f"{event['stage']}",
-                        refresh=True,
-                    )
-                progress.update(
+            update(
+                translate_task_id,
+                completed=event["overall_progress"],
+                refresh=refresh,
+            )
+
+        def on_end(event):
+            stage = event["stage"]
+            task_id = stage_tasks.get(stage)
+            if task_id is not None:
+                total = event["stage_total"]
+                update(
+                    task_id,
+                    completed=total,
+                    total=total,
+                    description=f"{label}{stage}",
+                    refresh=True,
+                )
+                update(
                     translate_task_id,
                     completed=event["overall_progress"],
                     refresh=True,
                 )
-            elif event["type"] == "progress_end":
-                stage = event["stage"]
-                if stage in stage_tasks:
-                    progress.update(
-                        stage_tasks[stage],
-                        completed=event["stage_total"],
-                        total=event["stage_total"],
-                        description=f"{event['stage']}",
-                        refresh=True,
-                    )
-                    progress.update(
-                        translate_task_id,
-                        completed=event["overall_progress"],
-                        refresh=True,
-                    )
-                progress.refresh()
-
-        return progress, progress_handler
+            progress.refresh()
+
+        handlers = {
+            "progress_start": on_start,
+            "progress_update": on_update,
+            "progress_end": on_end,
+        }
+
+        def progress_handler(event):
+            handler = handlers.get(event["type"])
+            if handler is not None:
+                handler(event)
+
+        return progress_context, progress_handler
     else:
-        pbar = tqdm.tqdm(total=100, desc="translate")
+        import tqdm
+
+        pbar = tqdm.tqdm(
+            total=100,
+            desc="translate",
+            mininterval=translation_config.report_interval,
+        )
+        pbar_update = pbar.update
+        set_description = pbar.set_description
+
+        def on_update(event):
+            pbar_update(event["overall_progress"] - pbar.n)
+            # 只更新描述文本，由 tqdm 按 mininterval 统一刷新
+            set_description(
+                f"{event['stage']} ({event['stage_current']}/{event['stage_total']})",
+                refresh=False,
+            )
+
+        def on_end(event):
+            set_description(f"{event['stage']} (Complete)")
+            pbar.refresh()
+
+        handlers = {
+            "progress_update": on_update,
+            "progress_end": on_end,
+        }
 
         def progress_handler(event):
-            if event["type"] == "progress_update":
-                pbar.update(event["overall_progress"] - pbar.n)
-                pbar.set_description(
-                    f"{event['stage']} ({event['stage_current']}/{event['stage_total']})",
-                )
-            elif event["type"] == "progress_end":
-                pbar.set_description(f"{event['stage']} (Complete)")
-                pbar.refresh()
+            handler = handlers.get(event["type"])
+            if handler is not None:
+                handler(event)
 
         return pbar, progress_handler
 
 
 # for backward compatibility
 def create_cache_folder():
+    import babeldoc.high_level
+
     return babeldoc.high_level.create_cache_folder()
 
 
 # for backward compatibility
 def download_font_assets():
+    import babeldoc.high_level
+
     return babeldoc.high_level.download_font_assets()
 
 
@@ -491,29 +721,29 @@ def cli():
 
     logging.basicConfig(level=logging.INFO, handlers=[RichHandler()])
 
-    logging.getLogger("httpx").setLevel("CRITICAL")
-    logging.getLogger("httpx").propagate = False
-    logging.getLogger("openai").setLevel("CRITICAL")
-    logging.getLogger("openai").propagate = False
-    logging.getLogger("httpcore").setLevel("CRITICAL")
-    logging.getLogger("httpcore").propagate = False
-    logging.getLogger("http11").setLevel("CRITICAL")
-    logging.getLogger("http11").propagate = False
-    for v in logging.Logger.manager.loggerDict.values():
-        if getattr(v, "name", None) is None:
-            continue
-        if (
-            v.name.startswith("pdfminer")
-            or v.name.startswith("peewee")
-            or v.name.startswith("httpx")
-            or "http11" in v.name
-            or "openai" in v.name
-        ):
-            v.disabled = True
-            v.propagate = False
-
-    babeldoc.high_level.init()
-    asyncio.run(main())
+    # Child loggers (e.g. pdfminer.pdfinterp) inherit the CRITICAL level, so
+    # configuring the top-level names is enough to silence them.
+    for name in SILENCED_LOGGERS:
+        silenced = logging.getLogger(name)
+        silenced.disabled = True
+        silenced.propagate = False
+        silenced.setLevel(logging.CRITICAL)
+
+    run_event_loop(main())
+
+
+def run_event_loop(coro):
+    """Run coro on uvloop when it is installed, otherwise on the default loop."""
+    try:
+        import uvloop
+    except ImportError:
+        # uvloop is optional and not available on Windows
+        return asyncio.run(coro)
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    uvloop.install()
+    return asyncio.run(coro)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,9 @@
 import logging
+from collections.abc import Callable
 from collections.abc import Sequence
 from typing import Any
 from typing import cast
 
-import numpy as np
 from pdfminer import settings
 from pdfminer.pdfcolor import PREDEFINED_COLORSPACE
 from pdfminer.pdfcolor import PDFColorSpace
@@ -38,6 +38,98 @@ from babeldoc.document_il.frontend.il_creater import ILCreater
 
 log = logging.getLogger(__name__)
 
+# Operators that are not re-emitted into the base content stream besides the
+# T* text operators: operators taking operands (EI's operand is an object, the
+# rest are marked-content operators) and operators without operands.
+_FILTERED_OPS_WITH_ARGS = frozenset({'"', "'", "EI", "MP", "DP", "BMC", "BDC"})
+_FILTERED_OPS_WITHOUT_ARGS = frozenset({"BI", "ID", "EMC"})
+# Text and marked-content operators; they never touch the graphics state or the
+# passthrough per-char instructions, so the do_TJ snapshot survives them.
+_GRAPHICSTATE_NEUTRAL_OPS = frozenset(
+    {"BT", "ET", "Tc", "Tw", "Tz", "TL", "Tf", "Tr", "Ts", "Td", "TD", "Tm", "T*"}
+    | {"Tj", "TJ", "'", '"', "BMC", "BDC", "EMC", "MP", "DP"}
+)
+# operator name -> do_* method name suffix, e.g. "f*" -> "f_a"
+_OPERATOR_NAME_TRANS = str.maketrans({"*": "_a", '"': "_w", "'": "_q"})
+
+
+def _fmt_arg(x: Any) -> str:
+    """Format an operand for re-emission into a content stream."""
+    if type(x) is float:
+        return f"{x:f}"
+    return str(x).replace("'", "")
+
+
+# Graphics operators whose operands are always numbers
+_NUMERIC_OPS = frozenset(
+    {"w", "J", "j", "M", "i", "cm", "m", "l", "c", "v", "y", "re"}
+    | {"G", "g", "RG", "rg", "K", "k"}
+)
+
+
+def _fmt_num(x: Any) -> str:
+    return f"{x:f}" if type(x) is float else str(x)
+
+
+def _make_formatter(name: str, nargs: int) -> Callable[[Any], str]:
+    """Build the function that re-emits an operator and its operands.
+
+    Fixed-arity numeric operators get a formatter unrolled for their arity;
+    everything else goes through the generic join.
+    """
+    suffix = f" {name} "
+    if name == "d":
+        return lambda args: f"[{' '.join(map(str, args[0]))}] {args[1]} d "
+    if nargs == 0:
+        # do_* 的返回值作为参数，可能为 None
+        return lambda targs: (
+            " ".join(map(_fmt_arg, targs)) + suffix if targs else suffix
+        )
+    if name in _NUMERIC_OPS:
+        if nargs == 1:
+            return lambda args: _fmt_num(args[0]) + suffix
+        if nargs == 2:
+            return lambda args: f"{_fmt_num(args[0])} {_fmt_num(args[1])}{suffix}"
+        if nargs == 4:
+            return lambda args: (
+                f"{_fmt_num(args[0])} {_fmt_num(args[1])} "
+                f"{_fmt_num(args[2])} {_fmt_num(args[3])}{suffix}"
+            )
+        if nargs == 6:
+            return lambda args: (
+                f"{_fmt_num(args[0])} {_fmt_num(args[1])} {_fmt_num(args[2])} "
+                f"{_fmt_num(args[3])} {_fmt_num(args[4])} {_fmt_num(args[5])}{suffix}"
+            )
+    return lambda args: " ".join(map(_fmt_arg, args)) + suffix
+
+
+def _invert_ctm(ctm: Matrix) -> Matrix:
+    """Invert an affine matrix (a, b, c, d, e, f) in the PDF row-vector convention."""
+    a, b, c, d, e, f = ctm
+    det = a * d - b * c
+    inv_a, inv_b, inv_c, inv_d = d / det, -b / det, -c / det, a / det
+    return (
+        inv_a,
+        inv_b,
+        inv_c,
+        inv_d,
+        -(e * inv_a + f * inv_c),
+        -(e * inv_b + f * inv_d),
+    )
+
+
+def _get_colorspace(spec: object) -> PDFColorSpace | None:
+    if isinstance(spec, list):
+        name = literal_name(spec[0])
+    else:
+        name = literal_name(spec)
+    if name == "ICCBased" and isinstance(spec, list) and len(spec) >= 2:
+        return PDFColorSpace(name, stream_value(spec[1])["N"])
+    elif name == "DeviceN" and isinstance(spec, list) and len(spec) >= 2:
+        return PDFColorSpace(name, len(list_value(spec[1])))
+    else:
+        return PREDEFINED_COLORSPACE.get(name)
+
 
 def safe_float(o: Any) -> float | None:
     try:
@@ -52,17 +144,35 @@ class PDFPageInterpreterEx(PDFPageInterpreter):
     Reference: PDF Reference, Appendix A, Operator Summary
     """
 
+    # operator name -> (do_* function, nargs, is_passthrough_per_char,
+    # formatter or None if not re-emitted, keeps_graphicstate) or None for
+    # unknown operators; shared by all interpreters (including the ones
+    # dup()ed for XObjects) and filled on first use of each operator.
+    _operators: dict[str, tuple | None] = {}
+    # PSKeyword -> (operator name, _operators entry); pdfminer interns
+    # keywords, so each operator is looked up by identity after its first use.
+    _keyword_operators: dict[PSKeyword, tuple[str, tuple | None]] = {}
+
     def __init__(
         self,
         rsrcmgr: PDFResourceManager,
         device: PDFDevice,
         obj_patch,
         il_creater: ILCreater,
+        font_cache: dict | None = None,
+        colorspace_cache: dict | None = None,
     ) -> None:
         self.rsrcmgr = rsrcmgr
         self.device = device
         self.obj_patch = obj_patch
         self.il_creater = il_creater
+        # 字体缓存在 dup() 出来的 XObject 解释器之间共享
+        self.font_cache = font_cache if font_cache is not None else {}
+        self.colorspace_cache = (
+            colorspace_cache if colorspace_cache is not None else {}
+        )
+        # do_TJ 传给 device 的图形状态快照，图形状态变化前可以复用
+        self._gs_snapshot = None
 
     def dup(self) -> "PDFPageInterpreterEx":
         return self.__class__(
@@ -70,8 +180,52 @@ class PDFPageInterpreterEx(PDFPageInterpreter):
             self.device,
             self.obj_patch,
             self.il_creater,
+            self.font_cache,
+            self.colorspace_cache,
         )
 
+    def get_font(self, objid: int | None, spec: object) -> PDFFont:
+        """Return the PDFFont of a font resource, building it only once.
+
+        Fonts are keyed by their object id, or by the identity of the inline
+        font dictionary when there is none, so the same font referenced from
+        many pages and form XObjects is resolved and constructed once.
+        """
+        if objid is not None:
+            key = ("obj", objid)
+        else:
+            key = ("inline", id(spec))
+        cached = self.font_cache.get(key)
+        if cached is not None:
+            return cached[1]
+        font = self.rsrcmgr.get_font(objid, dict_value(spec))
+        # keep spec alive so that its id() can't be reused by another dict
+        self.font_cache[key] = (spec, font)
+        return font
+
+    def get_colorspace(self, spec: object) -> PDFColorSpace | None:
+        """Return the colour space of a ColorSpace resource, parsing it once.
+
+        Specs held in indirect objects, or whose parameter (the ICC stream or
+        DeviceN colorant array) is one, are cached by object id; inline name
+        specs are cheap to resolve and looked up directly.
+        """
+        key = None
+        if isinstance(spec, PDFObjRef):
+            key = ("obj", spec.objid)
+            spec = resolve1(spec)
+        elif isinstance(spec, list) and len(spec) >= 2:
+            if isinstance(spec[1], PDFObjRef):
+                key = (literal_name(spec[0]), spec[1].objid)
+        else:
+            return _get_colorspace(resolve1(spec))
+        if key is not None and key in self.colorspace_cache:
+            return self.colorspace_cache[key]
+        colorspace = _get_colorspace(spec)
+        if key is not None:
+            self.colorspace_cache[key] = colorspace
+        return colorspace
+
     def init_resources(self, resources: dict[object, object]) -> None:
         # 重载设置 fontid 和 descent
         """Prepare the fonts and XObjects listed in the Resource attribute."""
@@ -83,42 +237,47 @@ class PDFPageInterpreterEx(PDFPageInterpreter):
         if not resources:
             return
 
-        def get_colorspace(spec: object) -> PDFColorSpace | None:
-            if isinstance(spec, list):
-                name = literal_name(spec[0])
-            else:
-                name = literal_name(spec)
-            if name == "ICCBased" and isinstance(spec, list) and len(spec) >= 2:
-                return PDFColorSpace(name, stream_value(spec[1])["N"])
-            elif name == "DeviceN" and isinstance(spec, list) and len(spec) >= 2:
-                return PDFColorSpace(name, len(list_value(spec[1])))
-            else:
-                return PREDEFINED_COLORSPACE.get(name)
-
+        handlers = self._resource_handlers
         for k, v in dict_value(resources).items():
             # log.debug("Resource: %r: %r", k, v)
-            if k == "Font":
-                for fontid, spec in dict_value(v).items():
-                    objid = None
-                    if isinstance(spec, PDFObjRef):
-                        objid = spec.objid
-                    spec = dict_value(spec)
-                    font = self.rsrcmgr.get_font(objid, spec)
-                    self.il_creater.on_page_resource_font(font, objid, fontid)
-                    self.fontmap[fontid] = font
-                    self.fontmap[fontid].descent = 0  # hack fix descent
-                    self.fontid[self.fontmap[fontid]] = fontid
-            elif k == "ColorSpace":
-                for csid, spec in dict_value(v).items():
-                    colorspace = get_colorspace(resolve1(spec))
-                    if colorspace is not None:
-                        self.csmap[csid] = colorspace
-            elif k == "ProcSet":
-                self.rsrcmgr.get_procset(list_value(v))
-            elif k == "XObject":
-                for xobjid, xobjstrm in dict_value(v).items():
-                    self.xobjmap[xobjid] = xobjstrm
-        pass
+            handler = handlers.get(k)
+            if handler is not None:
+                handler(self, v)
+
+    def _init_font_resources(self, fonts: object) -> None:
+        fontmap = self.fontmap
+        fontid_map = self.fontid
+        on_page_resource_font = self.il_creater.on_page_resource_font
+        for fontid, spec in dict_value(fonts).items():
+            objid = None
+            if isinstance(spec, PDFObjRef):
+                objid = spec.objid
+            font = self.get_font(objid, spec)
+            on_page_resource_font(font, objid, fontid)
+            fontmap[fontid] = font
+            font.descent = 0  # hack fix descent
+            fontid_map[font] = fontid
+
+    def _init_colorspace_resources(self, colorspaces: object) -> None:
+        csmap = self.csmap
+        for csid, spec in dict_value(colorspaces).items():
+            colorspace = self.get_colorspace(spec)
+            if colorspace is not None:
+                csmap[csid] = colorspace
+
+    def _init_procset_resources(self, procset: object) -> None:
+        self.rsrcmgr.get_procset(list_value(procset))
+
+    def _init_xobject_resources(self, xobjects: object) -> None:
+        self.xobjmap.update(dict_value(xobjects))
+
+    # resource category -> handler, used by init_resources
+    _resource_handlers = {
+        "Font": _init_font_resources,
+        "ColorSpace": _init_colorspace_resources,
+        "ProcSet": _init_procset_resources,
+        "XObject": _init_xobject_resources,
+    }
 
     def do_S(self) -> None:
         # 重载过滤非公式线条
@@ -151,8 +310,9 @@ class PDFPageInterpreterEx(PDFPageInterpreter):
         Introduced in PDF 1.1
         """
         try:
-            self.il_creater.on_stroking_color_space(literal_name(name))
-            self.scs = self.csmap[literal_name(name)]
+            cs_name = literal_name(name)
+            self.il_creater.on_stroking_color_space(cs_name)
+            self.scs = self.csmap[cs_name]
         except KeyError:
             if settings.STRICT:
                 raise PDFInterpreterError(f"Undefined ColorSpace: {name!r}") from None
@@ -161,8 +321,9 @@ class PDFPageInterpreterEx(PDFPageInterpreter):
     def do_cs(self, name: PDFStackT) -> None:
         """Set color space for nonstroking operations"""
         try:
-            self.il_creater.on_non_stroking_color_space(literal_name(name))
-            self.ncs = self.csmap[literal_name(name)]
+            cs_name = literal_name(name)
+            self.il_creater.on_non_stroking_color_space(cs_name)
+            self.ncs = self.csmap[cs_name]
         except KeyError:
             if settings.STRICT:
                 raise PDFInterpreterError(f"Undefined ColorSpace: {name!r}") from None
@@ -252,8 +413,8 @@ class PDFPageInterpreterEx(PDFPageInterpreter):
 
             # In extremely rare cases, a none might be mixed in the bbox, for example
             # /BBox [ 0 3.052 null 274.9 157.3 ]
-            bbox = list(
-                filter(lambda x: x is not None, cast(Rect, list_value(xobj["BBox"])))
+            bbox = cast(
+                Rect, [x for x in list_value(xobj["BBox"]) if x is not None]
             )
 
             matrix = cast(Matrix, list_value(xobj.get("Matrix", MATRIX_IDENTITY)))
@@ -271,14 +432,7 @@ class PDFPageInterpreterEx(PDFPageInterpreter):
             (x, y) = apply_matrix_pt(ctm, (x, y))
             (x2, y2) = apply_matrix_pt(ctm, (x2, y2))
             x_id = self.il_creater.on_xobj_begin((x, y, x2, y2), xobj.objid)
-            ctm_inv = np.linalg.inv(np.array(ctm[:4]).reshape(2, 2))
-            np_version = np.__version__
-            if np_version.split(".")[0] >= "2":
-                pos_inv = -np.asmatrix(ctm[4:]) * ctm_inv
-            else:
-                pos_inv = -np.mat(ctm[4:]) * ctm_inv
-            a, b, c, d = ctm_inv.reshape(4).tolist()
-            e, f = pos_inv.tolist()[0]
+            a, b, c, d, e, f = _invert_ctm(ctm)
             ops_base = interpreter.render_contents(
                 resources,
                 [xobj],
@@ -286,25 +440,14 @@ class PDFPageInterpreterEx(PDFPageInterpreter):
             )
             self.ncs = interpreter.ncs
             self.scs = interpreter.scs
-            self.il_creater.on_xobj_end(
-                x_id,
-                f"q {ops_base}Q {a} {b} {c} {d} {e} {f} cm ",
-            )
+            # 还原矩阵的前缀在 on_xobj_end 和 obj_patch 里相同，只格式化一次
+            xobj_ops = f"q {ops_base}Q {a} {b} {c} {d} {e} {f} cm "
+            self.il_creater.on_xobj_end(x_id, xobj_ops)
             try:  # 有的时候 form 字体加不上这里会烂掉
                 self.device.fontid = interpreter.fontid
                 self.device.fontmap = interpreter.fontmap
                 ops_new = self.device.end_figure(xobjid)
-                ctm_inv = np.linalg.inv(np.array(ctm[:4]).reshape(2, 2))
-                np_version = np.__version__
-                if np_version.split(".")[0] >= "2":
-                    pos_inv = -np.asmatrix(ctm[4:]) * ctm_inv
-                else:
-                    pos_inv = -np.mat(ctm[4:]) * ctm_inv
-                a, b, c, d = ctm_inv.reshape(4).tolist()
-                e, f = pos_inv.tolist()[0]
-                self.obj_patch[self.xobjmap[xobjid].objid] = (
-                    f"q {ops_base}Q {a} {b} {c} {d} {e} {f} cm {ops_new}"
-                )
+                self.obj_patch[self.xobjmap[xobjid].objid] = xobj_ops + ops_new
             except Exception:
                 pass
         elif subtype is LITERAL_IMAGE and "Width" in xobj and "Height" in xobj:
@@ -386,89 +529,118 @@ class PDFPageInterpreterEx(PDFPageInterpreter):
                 raise PDFInterpreterError("No font specified!")
             return
         assert self.ncs is not None
-        gs = self.graphicstate.copy()
-        gs.passthrough_instruction = (
-            self.il_creater.passthrough_per_char_instruction.copy()
-        )
+        # 快照只被下游读取，连续的文字指令之间共用同一份
+        gs = self._gs_snapshot
+        if gs is None:
+            gs = self.graphicstate.copy()
+            gs.passthrough_instruction = (
+                self.il_creater.passthrough_per_char_instruction.copy()
+            )
+            self._gs_snapshot = gs
         self.device.render_string(self.textstate, cast(PDFTextSeq, seq), self.ncs, gs)
         return
 
+    def _get_operator(self, name: str) -> tuple | None:
+        try:
+            return self._operators[name]
+        except KeyError:
+            pass
+        act_name = name.translate(_OPERATOR_NAME_TRANS)
+        func = getattr(type(self), f"do_{act_name}", None)
+        if func is None:
+            operator = None
+        else:
+            nargs = func.__code__.co_argcount - 1
+            # 过滤 T 系列文字指令，因为 EI 的参数是 obj 所以也需要过滤（只在少数文档中画横线时使用），过滤 marked 系列指令
+            filtered = (
+                _FILTERED_OPS_WITH_ARGS if nargs else _FILTERED_OPS_WITHOUT_ARGS
+            )
+            if name[0] == "T" or name in filtered:
+                formatter = None
+            else:
+                formatter = _make_formatter(name, nargs)
+            # is_passthrough_per_char_operation only depends on the operator name
+            is_passthrough = bool(
+                self.il_creater.is_passthrough_per_char_operation(name)
+            )
+            keeps_gs = name in _GRAPHICSTATE_NEUTRAL_OPS
+            operator = (func, nargs, is_passthrough, formatter, keeps_gs)
+        self._operators[name] = operator
+        return operator
+
     # Run PostScript commands
     # The Do_xxx method is the method for executing corresponding postscript instructions
     def execute(self, streams: Sequence[object]) -> None:
-        ops = ""
+        ops: list[str] = []
+        # 热循环里用到的属性和方法提前绑定为局部变量，省去逐 token 的属性查找
+        emit_op = ops.append
+        get_operator = self._get_operator
+        keyword_operators = self._keyword_operators
+        push = self.push
+        pop = self.pop
+        on_passthrough_per_char = self.il_creater.on_passthrough_per_char
         for stream in streams:
             self.il_creater.on_new_stream()
+            self._gs_snapshot = None
             # 重载返回指令流
             try:
                 parser = PDFContentParser([stream])
             except PSEOF:
                 # empty page
                 return
+            nextobject = parser.nextobject
+            # 解析位置是相对于解码后的流数据的偏移，参数和指令原样输出时直接切片
+            data = stream_value(stream).get_data()
+            # 当前指令第一个参数的偏移；参数栈里有上一条指令剩下的参数时为 None
+            args_start = None
             while True:
                 try:
-                    (_, obj) = parser.nextobject()
+                    (pos, obj) = nextobject()
                 except PSEOF:
                     break
                 if isinstance(obj, PSKeyword):
-                    name = keyword_name(obj)
-                    act_name = (
-                        name.replace("*", "_a").replace('"', "_w").replace("'", "_q")
-                    )
-                    method = f"do_{act_name}"
-                    if hasattr(self, method):
-                        func = getattr(self, method)
-                        nargs = func.__code__.co_argcount - 1
-                        if nargs:
-                            args = self.pop(nargs)
-                            # log.debug("exec: %s %r", name, args)
-                            if len(args) == nargs:
-                                func(*args)
-                                if self.il_creater.is_passthrough_per_char_operation(
-                                    name,
-                                ):
-                                    self.il_creater.on_passthrough_per_char(name, args)
-                                if name == "d":
-                                    arg0 = f"[{' '.join(f'{arg}' for arg in args[0])}]"
-                                    arg1 = args[1]
-                                    ops += f"{arg0} {arg1} {name} "
-                                elif not (
-                                    name[0] == "T"
-                                    or name
-                                    in ['"', "'", "EI", "MP", "DP", "BMC", "BDC"]
-                                ):  # 过滤 T 系列文字指令，因为 EI 的参数是 obj 所以也需要过滤（只在少数文档中画横线时使用），过滤 marked 系列指令
-                                    p = " ".join(
-                                        [
-                                            (
-                                                f"{x:f}"
-                                                if isinstance(x, float)
-                                                else str(x).replace("'", "")
-                                            )
-                                            for x in args
-                                        ],
-                                    )
-                                    ops += f"{p} {name} "
-                        else:
-                            # log.debug("exec: %s", name)
-                            targs = func()
-                            if targs is None:
-                                targs = []
-                            if not (name[0] == "T" or name in ["BI", "ID", "EMC"]):
-                                p = " ".join(
-                                    [
-                                        (
-                                            f"{x:f}"
-                                            if isinstance(x, float)
-                                            else str(x).replace("'", "")
-                                        )
-                                        for x in targs
-                                    ],
-                                )
-                                ops += f"{p} {name} "
-                    elif settings.STRICT:
-                        error_msg = f"Unknown operator: {name!r}"
-                        raise PDFInterpreterError(error_msg)
+                    start = args_start
+                    args_start = None
+                    entry = keyword_operators.get(obj)
+                    if entry is None:
+                        name = keyword_name(obj)
+                        entry = (name, get_operator(name))
+                        keyword_operators[obj] = entry
+                    name, operator = entry
+                    if operator is None:
+                        if settings.STRICT:
+                            error_msg = f"Unknown operator: {name!r}"
+                            raise PDFInterpreterError(error_msg)
+                        continue
+                    func, nargs, is_passthrough, formatter, keeps_gs = operator
+                    if not keeps_gs:
+                        self._gs_snapshot = None
+                    if nargs:
+                        args = pop(nargs)
+                        # log.debug("exec: %s %r", name, args)
+                        if len(args) == nargs:
+                            func(self, *args)
+                            if is_passthrough:
+                                on_passthrough_per_char(name, args)
+                            if formatter is None:
+                                pass
+                            elif start is not None and not self.argstack:
+                                # 参数和指令在源数据里是连续的一段，不用重新格式化
+                                chunk = data[start : pos + len(obj.name)]
+                                if chunk.isascii():
+                                    emit_op(chunk.decode("ascii") + " ")
+                                else:
+                                    emit_op(formatter(args))
+                            else:
+                                emit_op(formatter(args))
+                    else:
+                        # log.debug("exec: %s", name)
+                        targs = func(self)
+                        if formatter is not None:
+                            emit_op(formatter(targs))
                 else:
-                    self.push(obj)
+                    if args_start is None and not self.argstack:
+                        args_start = pos
+                    push(obj)
             # print('REV DATA',ops)
-        return ops
+        return "".join(ops)
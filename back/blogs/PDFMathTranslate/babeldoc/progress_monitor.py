@@ -30,8 +30,12 @@ class ProgressMonitor:
         self.finish_callback = finish_callback
         self.report_interval = report_interval
         logger.debug(f"report_interval: {self.report_interval}")
-        self.last_report_time = 0
+        self.last_report_time = 0.0
         self.finish_stage_count = 0
+        # Stages that have run to their total, and the sum of their weights,
+        # kept up to date so calculate_current_progress doesn't scan stages
+        self._completed_stages = set()
+        self._completed_weight = 0.0
         self.finish_event = finish_event
         self.cancel_event = cancel_event
         self.loop = loop
@@ -49,7 +53,6 @@ class ProgressMonitor:
                     for name, _ in stages
                 ],
             )
-        self.lock = threading.Lock()
 
     def stage_start(self, stage_name: str, total: int):
         if self.disable:
@@ -62,6 +65,8 @@ class ProgressMonitor:
         )
         stage.current = 0
         stage.total = total
+        stage.reset_batch()
+        self._update_completed(stage)
         if self.progress_change_callback:
             self.progress_change_callback(
                 type="progress_start",
@@ -114,22 +119,24 @@ class ProgressMonitor:
                 overall_progress=self.calculate_current_progress(),
             )
 
-    def calculate_current_progress(self, stage=None):
-        # Count completed stages
-        completed_stages = sum(
-            1 for s in self.stage.values() if s.run_time > 0 and s.current == s.total
-        )
+    def _update_completed(self, stage):
+        completed = stage.run_time > 0 and stage.current == stage.total
+        if completed == (stage in self._completed_stages):
+            return
+        if completed:
+            self._completed_stages.add(stage)
+            self._completed_weight += stage.weight
+        else:
+            self._completed_stages.discard(stage)
+            self._completed_weight -= stage.weight
 
+    def calculate_current_progress(self, stage=None):
         # If all stages are complete, return exactly 100
-        if completed_stages == len(self.stage):
+        if len(self._completed_stages) == len(self.stage):
             return 100
 
         # Calculate progress based on weights
-        progress = sum(
-            s.weight * 100
-            for s in self.stage.values()
-            if s.run_time > 0 and s.current == s.total
-        )
+        progress = self._completed_weight * 100
         if stage is not None and stage.total > 0:
             progress += stage.weight * stage.current * 100 / stage.total
         return progress
@@ -137,20 +144,22 @@ class ProgressMonitor:
     def stage_update(self, stage, n: int):
         if self.disable:
             return
-        with self.lock:
-            report_time_delta = time.time() - self.last_report_time
-            if report_time_delta < self.report_interval and stage.total > 3:
-                return
-            if self.progress_change_callback:
-                self.progress_change_callback(
-                    type="progress_update",
-                    stage=stage.display_name,
-                    stage_progress=stage.current * 100 / stage.total,
-                    stage_current=stage.current,
-                    stage_total=stage.total,
-                    overall_progress=self.calculate_current_progress(stage),
-                )
-                self.last_report_time = time.time()
+        self._update_completed(stage)
+        if not self.progress_change_callback:
+            return
+        # 不加锁：并发 advance 之间的竞争最多多触发一次回调
+        now = time.monotonic()
+        if now - self.last_report_time < self.report_interval and stage.total > 3:
+            return
+        self.last_report_time = now
+        self.progress_change_callback(
+            type="progress_update",
+            stage=stage.display_name,
+            stage_progress=stage.current * 100 / stage.total,
+            stage_current=stage.current,
+            stage_total=stage.total,
+            overall_progress=self.calculate_current_progress(stage),
+        )
 
     def translate_done(self, translate_result):
         if self.disable:
@@ -177,6 +186,9 @@ class ProgressMonitor:
 
 
 class TranslationStage:
+    # Upper bound of advance() steps folded into one stage_update() call
+    max_batch_threshold = 64
+
     def __init__(self, name: str, total: int, pm: ProgressMonitor, weight: float):
         self.name = name
         self.display_name = name
@@ -185,16 +197,60 @@ class TranslationStage:
         self.pm = pm
         self.run_time = 0
         self.weight = weight
+        self._lock = threading.Lock()
+        self.reset_batch()
+
+    def reset_batch(self):
+        # 小阶段逐项上报，大阶段每个线程最多攒 max_batch_threshold 项再上报一次
+        # advance() 会在翻译线程池中并发调用，未上报的计数按线程分开保存，
+        # 只有合并进 current 时才需要加锁
+        self._local = threading.local()
+        self._pending_counters = []
+        self.batch_threshold = max(
+            1, min(self.max_batch_threshold, self.total // 100)
+        )
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
         self.pm.stage_done(self)
 
+    def _pending_counter(self) -> list[int]:
+        try:
+            return self._local.counter
+        except AttributeError:
+            counter = self._local.counter = [0]
+            with self._lock:
+                self._pending_counters.append(counter)
+            return counter
+
+    def _flush_counter(self, counter: list[int]):
+        with self._lock:
+            n = counter[0]
+            if not n:
+                return
+            counter[0] = 0
+            self.current += n
+            self.pm.stage_update(self, n)
+
+    def flush(self):
+        """Fold every thread's pending count into current.
+
+        Called from __exit__, once the threads advancing this stage are done.
+        """
+        for counter in list(self._pending_counters):
+            self._flush_counter(counter)
+
     def advance(self, n: int = 1):
-        self.current += n
-        self.pm.stage_update(self, n)
+        counter = self._pending_counter()
+        counter[0] += n
+        if (
+            counter[0] >= self.batch_threshold
+            or self.current + counter[0] >= self.total
+        ):
+            self._flush_counter(counter)
 
 
 class DummyTranslationStage:
@@ -3,9 +3,12 @@
 
 
 import argparse
+import concurrent.futures
 import hashlib
 import io
 import logging
+import mmap
+import sys
 from pathlib import Path
 
 import babeldoc.high_level
@@ -18,6 +21,18 @@ from rich.logging import RichHandler
 logger = logging.getLogger(__name__)
 
 
+def file_sha3_256(path: Path) -> str:
+    with path.open("rb") as f:
+        if sys.version_info >= (3, 11):
+            return hashlib.file_digest(f, "sha3_256").hexdigest()
+        hash_ = hashlib.sha3_256()
+        # mmap can't map an empty file
+        if path.stat().st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hash_.update(mm)
+        return hash_.hexdigest()
+
+
 def get_font_metadata(font_path) -> PdfFont:
     doc = pymupdf.open()
     page = doc.new_page(width=1000, height=1000)
@@ -47,6 +62,25 @@ def get_font_metadata(font_path) -> PdfFont:
     return font_metadata
 
 
+def process_font(font_path: Path) -> tuple[str, dict]:
+    logger.info(f"Getting font metadata for {font_path}")
+    extracted_metadata = get_font_metadata(font_path)
+    metadata = {
+        "file_name": font_path.name,
+        "font_name": extracted_metadata.name,
+        "encoding_length": extracted_metadata.encoding_length,
+        "bold": extracted_metadata.bold,
+        "italic": extracted_metadata.italic,
+        "monospace": extracted_metadata.monospace,
+        "serif": extracted_metadata.serif,
+        "ascent": extracted_metadata.ascent,
+        "descent": extracted_metadata.descent,
+        "sha3_256": file_sha3_256(font_path),
+        "size": font_path.stat().st_size,
+    }
+    return font_path.name, metadata
+
+
 def main():
     logging.basicConfig(level=logging.INFO, handlers=[RichHandler()])
     parser = argparse.ArgumentParser(description="Get font metadata.")
@@ -62,39 +96,19 @@ def main():
     )
     logger.info(f"Getting font metadata for {repo_path}")
 
-    metadatas = {}
-    for font_path in list((repo_path / "fonts").glob("**/*.ttf")):
-        logger.info(f"Getting font metadata for {font_path}")
-        with Path(font_path).open("rb") as f:
-            # Read the file in chunks to handle large files efficiently
-            hash_ = hashlib.sha3_256()
-            while True:
-                chunk = f.read(1024 * 1024)
-                if not chunk:
-                    break
-                hash_.update(chunk)
-        extracted_metadata = get_font_metadata(font_path)
-        metadata = {
-            "file_name": font_path.name,
-            "font_name": extracted_metadata.name,
-            "encoding_length": extracted_metadata.encoding_length,
-            "bold": extracted_metadata.bold,
-            "italic": extracted_metadata.italic,
-            "monospace": extracted_metadata.monospace,
-            "serif": extracted_metadata.serif,
-            "ascent": extracted_metadata.ascent,
-            "descent": extracted_metadata.descent,
-            "sha3_256": hash_.hexdigest(),
-            "size": font_path.stat().st_size,
-        }
-        metadatas[font_path.name] = metadata
-    metadatas = orjson.dumps(
+    font_paths = list((repo_path / "fonts").glob("**/*.ttf"))
+    # 每个字体都要单独跑一遍 PyMuPDF 和解析流程，用多进程并行
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        metadatas = dict(executor.map(process_font, font_paths))
+    data = orjson.dumps(
         metadatas,
         option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS,
-    ).decode()
-    print(f"FONT METADATA: {metadatas}")
-    with (repo_path / "font_metadata.json").open("w") as f:
-        f.write(metadatas)
+    )
+    # RichHandler 经文本层写日志，先清空它的缓冲，避免 JSON 与日志输出交错
+    sys.stdout.flush()
+    sys.stdout.buffer.write(b"FONT METADATA: " + data)
+    sys.stdout.buffer.flush()
+    (repo_path / "font_metadata.json").write_bytes(data)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,13 @@
+import atexit
+import bisect
 import enum
+import functools
 import logging
+import os
+import queue
+import re
 import shutil
+import sys
 import tempfile
 import threading
 from pathlib import Path
@@ -8,10 +15,127 @@ from pathlib import Path
 from babeldoc.const import CACHE_FOLDER
 from babeldoc.document_il.translator.translator import BaseTranslator
 from babeldoc.docvision.doclayout import DocLayoutModel
+from babeldoc.fsutils import ensure_dir
 from babeldoc.progress_monitor import ProgressMonitor
 
 logger = logging.getLogger(__name__)
 
+# One comma-separated part of a page string: "3", "1-5", "2-" or "-4"
+_PAGE_RANGE_RE = re.compile(r"\s*(\d*)\s*(-?)\s*(\d*)\s*(,|\Z)")
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_page_ranges(pages_str: str) -> tuple[tuple[int, int], ...]:
+    ranges = []
+    pos = 0
+    while True:
+        m = _PAGE_RANGE_RE.match(pages_str, pos)
+        if m is None:
+            raise ValueError(f"Invalid pages: {pages_str!r}")
+        start, dash, end, sep = m.groups()
+        if dash:
+            ranges.append((int(start) if start else 1, int(end) if end else -1))
+        elif start and not end:
+            page = int(start)
+            ranges.append((page, page))
+        else:
+            raise ValueError(f"Invalid pages: {pages_str!r}")
+        if not sep:
+            return tuple(ranges)
+        pos = m.end()
+
+
+def _merge_page_ranges(
+    ranges: list[tuple[int, int]] | None,
+) -> tuple[list[int], list[int]]:
+    """Merge page ranges into sorted, disjoint (starts, ends) lists.
+
+    An open end (-1) becomes sys.maxsize; empty ranges are dropped.
+    """
+    merged: list[list[int]] = []
+    for start, end in sorted(
+        (start, sys.maxsize if end == -1 else end) for start, end in ranges or ()
+    ):
+        if start > end:
+            continue
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [start for start, _ in merged], [end for _, end in merged]
+
+
+# 清空后可复用的临时工作目录，省去每次翻译的 mkdtemp 和 rmtree
+_WDIR_POOL: queue.Queue[str] = queue.Queue(maxsize=8)
+
+
+def _acquire_wdir() -> str:
+    try:
+        return _WDIR_POOL.get_nowait()
+    except queue.Empty:
+        return tempfile.mkdtemp()
+
+
+# POSIX 上可以基于目录 fd 删除，每个文件省去一次完整路径解析
+_HAVE_FD_RMTREE = (
+    os.scandir in os.supports_fd
+    and os.unlink in os.supports_dir_fd
+    and os.rmdir in os.supports_dir_fd
+)
+
+
+def _clear_dir(path: str, dir_fd: int | None = None) -> None:
+    """Remove everything inside ``path``, keeping the directory itself.
+
+    Uses the d_type returned by scandir to tell files from directories, so
+    unlike shutil.rmtree no entry needs an extra stat.
+    """
+    if not _HAVE_FD_RMTREE:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    _fast_rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY, dir_fd=dir_fd)
+    try:
+        with os.scandir(fd) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    _fast_rmtree(entry.name, fd)
+                else:
+                    os.unlink(entry.name, dir_fd=fd)
+    finally:
+        os.close(fd)
+
+
+def _fast_rmtree(path: str, dir_fd: int | None = None) -> None:
+    _clear_dir(path, dir_fd)
+    if dir_fd is None:
+        os.rmdir(path)
+    else:
+        os.rmdir(path, dir_fd=dir_fd)
+
+
+def _release_wdir(path: str) -> None:
+    """Empty a temporary working directory and return it to the pool."""
+    try:
+        _clear_dir(path)
+        _WDIR_POOL.put_nowait(path)
+    except (OSError, queue.Full):
+        shutil.rmtree(path, ignore_errors=True)
+
+
+@atexit.register
+def _drain_wdir_pool() -> None:
+    while True:
+        try:
+            path = _WDIR_POOL.get_nowait()
+        except queue.Empty:
+            return
+        shutil.rmtree(path, ignore_errors=True)
+
 
 class WatermarkOutputMode(enum.Enum):
     Watermarked = "watermarked"
@@ -20,6 +144,44 @@ class WatermarkOutputMode(enum.Enum):
 
 
 class TranslationConfig:
+    # 属性集合是固定的，用 slots 省去实例 __dict__
+    __slots__ = (
+        "translator",
+        "input_file",
+        "lang_in",
+        "lang_out",
+        "font",
+        "pages",
+        "page_ranges",
+        "_page_range_starts",
+        "_page_range_ends",
+        "debug",
+        "watermark_output_mode",
+        "output_dir",
+        "working_dir",
+        "_output_dir_path",
+        "_working_dir_path",
+        "no_dual",
+        "no_mono",
+        "formular_font_pattern",
+        "formular_char_pattern",
+        "formular_font_regex",
+        "formular_char_regex",
+        "qps",
+        "split_short_lines",
+        "short_line_split_factor",
+        "use_rich_pbar",
+        "progress_monitor",
+        "doc_layout_model",
+        "skip_clean",
+        "dual_translate_first",
+        "disable_rich_text_translate",
+        "report_interval",
+        "min_text_length",
+        "use_alternating_pages_dual",
+        "_is_temp_dir",
+    )
+
     def __init__(
         self,
         translator: BaseTranslator,
@@ -62,6 +224,10 @@ class TranslationConfig:
 
         self.pages = pages
         self.page_ranges = self._parse_pages(pages) if pages else None
+        # should_translate_page 用二分查找合并后的区间
+        self._page_range_starts, self._page_range_ends = _merge_page_ranges(
+            self.page_ranges
+        )
         self.debug = debug
         self.watermark_output_mode = watermark_output_mode
 
@@ -72,6 +238,13 @@ class TranslationConfig:
 
         self.formular_font_pattern = formular_font_pattern
         self.formular_char_pattern = formular_char_pattern
+        # 公式识别按字体、按字符逐个匹配，这里只编译一次
+        self.formular_font_regex = (
+            re.compile(formular_font_pattern) if formular_font_pattern else None
+        )
+        self.formular_char_regex = (
+            re.compile(formular_char_pattern) if formular_char_pattern else None
+        )
         self.qps = qps
         self.split_short_lines = split_short_lines
 
@@ -98,22 +271,28 @@ class TranslationConfig:
         if progress_monitor and progress_monitor.cancel_event is None:
             progress_monitor.cancel_event = threading.Event()
 
+        self._is_temp_dir = False
         if working_dir is None:
             if debug:
                 working_dir = Path(CACHE_FOLDER) / "working" / Path(input_file).stem
                 self._is_temp_dir = False
             else:
-                working_dir = tempfile.mkdtemp()
+                working_dir = _acquire_wdir()
                 self._is_temp_dir = True
         self.working_dir = working_dir
 
-        Path(working_dir).mkdir(parents=True, exist_ok=True)
+        # 池中的临时目录必然存在；只检查调用方或调试模式给出的目录，
+        # 以免 _ensured_dirs 随每个临时目录无限增长
+        if not self._is_temp_dir:
+            ensure_dir(working_dir)
 
         if output_dir is None:
             output_dir = Path.cwd()
         self.output_dir = output_dir
 
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        ensure_dir(output_dir)
+        self._output_dir_path = Path(output_dir)
+        self._working_dir_path = Path(working_dir)
 
         if not doc_layout_model:
             doc_layout_model = DocLayoutModel.load_available()
@@ -131,18 +310,7 @@ class TranslationConfig:
         if not pages_str:
             return None
 
-        ranges: list[tuple[int, int]] = []
-        for part in pages_str.split(","):
-            part = part.strip()
-            if "-" in part:
-                start, end = part.split("-")
-                start_as_int = int(start) if start else 1
-                end_as_int = int(end) if end else -1
-                ranges.append((start_as_int, end_as_int))
-            else:
-                page = int(part)
-                ranges.append((page, page))
-        return ranges
+        return list(_parse_page_ranges(pages_str))
 
     def should_translate_page(self, page_number: int) -> bool:
         """判断指定页码是否需要翻译
@@ -154,16 +322,14 @@ class TranslationConfig:
         if not self.page_ranges:
             return True
 
-        for start, end in self.page_ranges:
-            if start <= page_number and (end == -1 or page_number <= end):
-                return True
-        return False
+        i = bisect.bisect_right(self._page_range_starts, page_number) - 1
+        return i >= 0 and page_number <= self._page_range_ends[i]
 
     def get_output_file_path(self, filename: str) -> Path:
-        return Path(self.output_dir) / filename
+        return self._output_dir_path / filename
 
     def get_working_file_path(self, filename: str) -> Path:
-        return Path(self.working_dir) / filename
+        return self._working_dir_path / filename
 
     def raise_if_cancelled(self):
         if self.progress_monitor is not None:
@@ -176,10 +342,21 @@ class TranslationConfig:
     def cleanup_temp_files(self):
         if self._is_temp_dir:
             logger.info(f"cleanup temp files: {self.working_dir}")
-            shutil.rmtree(self.working_dir)
+            # 只归还一次，避免同一个目录被两个任务同时使用
+            self._is_temp_dir = False
+            _release_wdir(self.working_dir)
 
 
 class TranslateResult:
+    __slots__ = (
+        "original_pdf_path",
+        "total_seconds",
+        "mono_pdf_path",
+        "dual_pdf_path",
+        "no_watermark_mono_pdf_path",
+        "no_watermark_dual_pdf_path",
+    )
+
     original_pdf_path: str
     total_seconds: float
     mono_pdf_path: str | None
@@ -190,6 +367,9 @@ class TranslateResult:
     def __init__(self, mono_pdf_path: str | None, dual_pdf_path: str | None):
         self.mono_pdf_path = mono_pdf_path
         self.dual_pdf_path = dual_pdf_path
+        # Filled in by the caller once the translation has finished.
+        self.original_pdf_path = None
+        self.total_seconds = 0.0
 
         # For compatibility considerations, if only a non-watermarked PDF is generated,
         # the values of mono_pdf_path and no_watermark_mono_pdf_path are the same.
@@ -199,37 +379,21 @@ class TranslateResult:
     def __str__(self):
         """Return a human-readable string representation of the translation result."""
         result = []
-        if hasattr(self, "original_pdf_path") and self.original_pdf_path:
+        if self.original_pdf_path:
             result.append(f"\tOriginal PDF: {self.original_pdf_path}")
-
-        if hasattr(self, "total_seconds") and self.total_seconds:
+        if self.total_seconds:
             result.append(f"\tTotal time: {self.total_seconds:.2f} seconds")
-
         if self.mono_pdf_path:
             result.append(f"\tMonolingual PDF: {self.mono_pdf_path}")
-
         if self.dual_pdf_path:
             result.append(f"\tDual-language PDF: {self.dual_pdf_path}")
-
-        if (
-            hasattr(self, "no_watermark_mono_pdf_path")
-            and self.no_watermark_mono_pdf_path
-            and self.no_watermark_mono_pdf_path != self.mono_pdf_path
-        ):
-            result.append(
-                f"\tNo-watermark Monolingual PDF: {self.no_watermark_mono_pdf_path}"
-            )
-
-        if (
-            hasattr(self, "no_watermark_dual_pdf_path")
-            and self.no_watermark_dual_pdf_path
-            and self.no_watermark_dual_pdf_path != self.dual_pdf_path
-        ):
-            result.append(
-                f"\tNo-watermark Dual-language PDF: {self.no_watermark_dual_pdf_path}"
-            )
-
-        if result:
-            result.insert(0, "Translation results:")
-
-        return "\n".join(result) if result else "No translation results available"
+        no_watermark_mono = self.no_watermark_mono_pdf_path
+        if no_watermark_mono and no_watermark_mono != self.mono_pdf_path:
+            result.append(f"\tNo-watermark Monolingual PDF: {no_watermark_mono}")
+        no_watermark_dual = self.no_watermark_dual_pdf_path
+        if no_watermark_dual and no_watermark_dual != self.dual_pdf_path:
+            result.append(f"\tNo-watermark Dual-language PDF: {no_watermark_dual}")
+
+        if not result:
+            return "No translation results available"
+        return "Translation results:\n" + "\n".join(result)
@@ -1,8 +1,9 @@
 from .high_level import translate, download_remote_fonts
-from .doclayout import OnnxModel, ModelInstance
 
 
 def aipdf(files, save_path):
+    from .doclayout import get_model
+
     params = {
         'lang_in': 'en',
         'lang_out': 'zh',
@@ -10,8 +11,7 @@ def aipdf(files, save_path):
         'thread': 4,
     }
 
-    ModelInstance.value = OnnxModel.load_available()
-    (file_mono, file_dual) = translate(files=[files], model=ModelInstance.value, save_path=save_path, **params)[0]
+    (file_mono, file_dual) = translate(files=[files], model=get_model(), save_path=save_path, **params)[0]
 
     return file_mono
 
@@ -1,5 +1,6 @@
 import abc
 import os.path
+import threading
 
 import cv2
 import numpy as np
@@ -79,6 +80,9 @@ class OnnxModel(DocLayoutModel):
         self._names = ast.literal_eval(metadata["names"])
 
         self.model = onnxruntime.InferenceSession(model.SerializeToString())
+        # 导出时 batch 维度是动态的才能一次推理多页，否则退回逐页推理
+        batch_dim = self.model.get_inputs()[0].shape[0]
+        self.max_batch_size = 1 if isinstance(batch_dim, int) else None
 
     @staticmethod
     def from_pretrained():
@@ -156,24 +160,62 @@ class OnnxModel(DocLayoutModel):
         return boxes
 
     def predict(self, image, imgsz=1024, **kwargs):
-        # Preprocess input image
-        orig_h, orig_w = image.shape[:2]
-        pix = self.resize_and_pad_image(image, new_shape=imgsz)
-        pix = np.transpose(pix, (2, 0, 1))  # CHW
-        pix = np.expand_dims(pix, axis=0)  # BCHW
-        pix = pix.astype(np.float32) / 255.0  # Normalize to [0, 1]
-        new_h, new_w = pix.shape[2:]
-
-        # Run inference
-        preds = self.model.run(None, {"images": pix})[0]
-
-        # Postprocess predictions
-        preds = preds[preds[..., 4] > 0.25]
-        preds[..., :4] = self.scale_boxes(
-            (new_h, new_w), preds[..., :4], (orig_h, orig_w)
-        )
-        return [YoloResult(boxes=preds, names=self._names)]
+        """
+        Predict the layout of one page, or of several pages of the same size.
+
+        Args:
+            image: A single HWC image, or a list of images sharing one shape.
+            imgsz: Resize the images to this size. Must be a multiple of the stride.
+            **kwargs: Additional arguments.
+
+        Returns:
+            A list of YoloResult objects, one for each input image.
+        """
+        images = [image] if isinstance(image, np.ndarray) else image
+        orig_h, orig_w = images[0].shape[:2]
+        batch_size = self.max_batch_size or len(images)
+        results = []
+        for start in range(0, len(images), batch_size):
+            # Preprocess input images
+            pix = np.stack(
+                [
+                    np.transpose(
+                        self.resize_and_pad_image(img, new_shape=imgsz), (2, 0, 1)
+                    )  # CHW
+                    for img in images[start : start + batch_size]
+                ]
+            )  # BCHW
+            pix = pix.astype(np.float32) / 255.0  # Normalize to [0, 1]
+            new_h, new_w = pix.shape[2:]
+
+            # Run inference
+            batch_preds = self.model.run(None, {"images": pix})[0]
+
+            # Postprocess predictions
+            for preds in batch_preds:
+                preds = preds[preds[..., 4] > 0.25]
+                preds[..., :4] = self.scale_boxes(
+                    (new_h, new_w), preds[..., :4], (orig_h, orig_w)
+                )
+                results.append(YoloResult(boxes=preds, names=self._names))
+        return results
 
 
 class ModelInstance:
     value: OnnxModel = None
+
+
+_model_lock = threading.Lock()
+
+
+def get_model() -> OnnxModel:
+    """Return the shared layout model, loading it on first use.
+
+    Every caller goes through this one lock, so concurrent first requests in a
+    process load the ONNX session only once.
+    """
+    if ModelInstance.value is None:
+        with _model_lock:
+            if ModelInstance.value is None:
+                ModelInstance.value = OnnxModel.load_available()
+    return ModelInstance.value
@@ -67,6 +67,33 @@ def check_files(files: List[str]) -> List[str]:
     return missing_files
 
 
+def predict_layouts(model: OnnxModel, doc_zh: Document, pagenos: list[int]) -> list:
+    """Render the given pages and run layout detection on them.
+
+    Consecutive pages with the same size go through the model in one batch.
+    Returns a (height, width, layout) tuple per page, in order.
+    """
+    images = []
+    for pageno in pagenos:
+        pix = doc_zh[pageno].get_pixmap()
+        images.append(
+            np.frombuffer(pix.samples, np.uint8).reshape(pix.height, pix.width, 3)[
+                :, :, ::-1
+            ]
+        )
+    results = []
+    start = 0
+    while start < len(images):
+        shape = images[start].shape
+        end = start + 1
+        while end < len(images) and images[end].shape == shape:
+            end += 1
+        layouts = model.predict(images[start:end], imgsz=int(shape[0] / 32) * 32)
+        results.extend((shape[0], shape[1], layout) for layout in layouts)
+        start = end
+    return results
+
+
 def translate_patch(
         inf: BinaryIO,
         pages: Optional[list[int]] = None,
@@ -85,6 +112,7 @@ def translate_patch(
         envs: Dict = None,
         prompt: Template = None,
         update_progress=None,
+        layout_batch_size: int = 1,
         **kwarg: Any,
 ) -> None:
     rsrcmgr = PDFResourceManager()
@@ -114,6 +142,9 @@ def translate_patch(
 
     parser = PDFParser(inf)
     doc = PDFDocument(parser)
+    # 版面分析结果按页预取：一次渲染并推理 layout_batch_size 页
+    selected = [p for p in range(doc_zh.page_count) if not pages or p in pages]
+    page_layouts = {}
     with tqdm.tqdm(total=total_pages) as progress:
         for pageno, page in enumerate(PDFPage.create_pages(doc)):
             update_progress(int(progress.n/progress.total*100))
@@ -125,13 +156,13 @@ def translate_patch(
             if callback:
                 callback(progress)
             page.pageno = pageno
-            pix = doc_zh[page.pageno].get_pixmap()
-            image = np.fromstring(pix.samples, np.uint8).reshape(
-                pix.height, pix.width, 3
-            )[:, :, ::-1]
-            page_layout = model.predict(image, imgsz=int(pix.height / 32) * 32)[0]
+            if pageno not in page_layouts:
+                start = selected.index(pageno)
+                batch = selected[start : start + max(1, layout_batch_size)]
+                page_layouts = dict(zip(batch, predict_layouts(model, doc_zh, batch)))
+            image_h, image_w, page_layout = page_layouts.pop(pageno)
             # kdtree 是不可能 kdtree 的，不如直接渲染成图片，用空间换时间
-            box = np.ones((pix.height, pix.width))
+            box = np.ones((image_h, image_w))
             h, w = box.shape
             vcls = ["abandon", "figure", "table", "isolate_formula", "formula_caption"]
             for i, d in enumerate(page_layout.boxes):
@@ -183,6 +214,7 @@ def translate_stream(
         prompt: Template = None,
         skip_subset_fonts: bool = False,
         update_progress=None,
+        layout_batch_size: int = 1,
         **kwarg: Any,
 ):
     font_list = [("tiro", None)]
@@ -347,6 +379,7 @@ def translate(
         skip_subset_fonts: bool = False,
         save_path: str = "",
         update_progress=None,
+        layout_batch_size: int = 1,
         **kwarg: Any,
 ):
     if not files:
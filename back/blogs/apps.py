@@ -1,4 +1,7 @@
+import os
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class BlogsConfig(AppConfig):
@@ -6,6 +9,10 @@ class BlogsConfig(AppConfig):
     name = "blogs"
 
     def ready(self):
-        # 确保任务模块被加载
+        # migrate、collectstatic 等管理命令用不到 Celery 任务，跳过导入
+        if os.environ.get('DJANGO_SKIP_TASK_IMPORT'):
+            return
+        # 大文件上传的临时目录，需要在处理上传请求前存在
+        os.makedirs(settings.FILE_UPLOAD_TEMP_DIR, exist_ok=True)
+        # 确保任务模块被加载；任务名已在 shared_task(name=...) 中写死，无需再校验
         from . import tasks  # noqa
-        assert tasks.aipdf.name == 'blogs.tasks.aipdf'  # 验证任务名称
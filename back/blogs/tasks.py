@@ -1,18 +1,114 @@
-from .PDFMathTranslate.pdf2zh.high_level import translate, download_remote_fonts
-from .PDFMathTranslate.pdf2zh.doclayout import OnnxModel, ModelInstance
+import asyncio
+import logging
+import threading
+import time
+from types import MappingProxyType
+
 from celery import shared_task
+from celery.signals import worker_process_init
 from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
+
+logger = logging.getLogger(__name__)
+
+_PARAMS = MappingProxyType({
+    'lang_in': 'en',
+    'lang_out': 'zh',
+    'service': 'google',
+    # DeepSeek 的密钥不写在代码里：pdf2zh 会自行读取 DEEPSEEK_API_KEY /
+    # DEEPSEEK_MODEL 环境变量，未设置时沿用其配置文件中保存的值
+    # 'service': 'deepseek',
+    'thread': 4,
+    # 版面分析每次推理的页数，取翻译线程数的两倍
+    'layout_batch_size': 8,
+})
+
+# 进度消息通过常驻的事件循环线程发送，避免每次 async_to_sync 切换事件循环
+_progress_loop = None
+_progress_loop_lock = threading.Lock()
+_progress_send_lock = None
+_channel_layer = None
+
+
+def get_model():
+    # pdf2zh 会拉起 ONNX Runtime、pdfminer 等重依赖，只在 worker 真正需要时导入；
+    # 加载逻辑和锁都在 doclayout.get_model，与 pdf2zh.api 共用同一个模型
+    from .PDFMathTranslate.pdf2zh.doclayout import get_model as load_model
+
+    return load_model()
+
+
+def get_cached_channel_layer():
+    # 每个进程只解析一次 CHANNEL_LAYERS 配置
+    global _channel_layer
+    if _channel_layer is None:
+        _channel_layer = get_channel_layer()
+    return _channel_layer
+
+
+def get_progress_loop():
+    global _progress_loop
+    if _progress_loop is None:
+        with _progress_loop_lock:
+            if _progress_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='progress-loop', daemon=True).start()
+                _progress_loop = loop
+    return _progress_loop
 
 
-@shared_task(bind=True, name='blogs.tasks.aipdf')
+async def _group_send(channel_layer, group, payload):
+    global _progress_send_lock
+    if _progress_send_lock is None:
+        _progress_send_lock = asyncio.Lock()
+    # 按提交顺序逐条发送，保证前端收到的进度不会倒退
+    async with _progress_send_lock:
+        await channel_layer.group_send(group, payload)
+
+
+def _report_send_error(future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning('Failed to send progress: %s', future.exception())
+
+
+def send_progress(channel_layer, group, payload):
+    # 提交到事件循环线程后立即返回，不等待发送完成
+    future = asyncio.run_coroutine_threadsafe(
+        _group_send(channel_layer, group, payload), get_progress_loop()
+    )
+    future.add_done_callback(_report_send_error)
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    # prefork 的每个 worker 进程启动时预先加载模型，并启动发送进度的事件循环线程；
+    # 加载失败（如模型下载失败）只记录日志，不让进程启动失败，第一次执行任务时再加载
+    try:
+        get_model()
+    except Exception:
+        logger.exception('Failed to preload the layout model, loading it on first use')
+    get_cached_channel_layer()
+    get_progress_loop()
+
+
+@shared_task(bind=True, name='blogs.tasks.aipdf', acks_late=True, reject_on_worker_lost=True)
 def aipdf(self, file_path, save_path):
+    from .PDFMathTranslate.pdf2zh.high_level import translate
+
     # 获取 Channels 层
-    channel_layer = get_channel_layer()
+    channel_layer = get_cached_channel_layer()
+    group_name = f'progress_{self.request.id}'
+    last = {'progress': -1, 'time': 0.0}
 
     def update_progress(progress):
-        async_to_sync(channel_layer.group_send)(
-            f'progress_{self.request.id}',
+        # 进度没变且距上次发送不到 100ms 时不发送，减少跨线程调用和 Redis 往返
+        now = time.monotonic()
+        if progress == last['progress'] and now - last['time'] < 0.1:
+            return
+        last['progress'] = progress
+        last['time'] = now
+        send_progress(
+            channel_layer,
+            group_name,
             {
                 'type': 'progress_update',
                 'progress': progress,
@@ -20,26 +116,15 @@ def aipdf(self, file_path, save_path):
             }
         )
 
-    params = {
-        'lang_in': 'en',
-        'lang_out': 'zh',
-        'service': 'google',
-        # 'service': 'deepseek',
-        'thread': 4,
-    }
-
     try:
-        ModelInstance.value = OnnxModel.load_available()
-        (file_mono, file_dual) = translate(files=[file_path], model=ModelInstance.value, save_path=save_path,
-                                           envs={'DEEPSEEK_API_KEY': 'sk-6f07edb501904443af1a0c14626d314f',
-                                                 'DEEPSEEK_MODEL': 'deepseek-chat'},
+        (file_mono, file_dual) = translate(files=[file_path], model=get_model(), save_path=save_path,
                                            update_progress=update_progress,
-                                           **params)[0]
+                                           **_PARAMS)[0]
 
         # (file_mono, file_dual) = translate(files=[file_path], model=ModelInstance.value, save_path=save_path,
-        #                                    update_progress=update_progress, **params)[0]
+        #                                    update_progress=update_progress, **_PARAMS)[0]
 
         # 返回处理后的文件
         return file_mono
-    except Exception as e:
-        print(f"An error occurred: {e}")
+    except Exception:
+        logger.exception('aipdf failed for %s', file_path)
@@ -1,7 +1,42 @@
-from django.test import TestCase
+import os
+import sys
+from unittest import mock
 
-# Create your tests here.
-from .PDFMathTranslate.pdf2zh.api import aipdf
+from django.apps import apps
+from django.test import SimpleTestCase
 
+import blogs
 
-aipdf(r'D:\tmpShen\Desktop\IDKL.pdf', r'D:\tmpShen\Desktop')
\ No newline at end of file
+
+class BlogsConfigReadyTests(SimpleTestCase):
+    def setUp(self):
+        # 从 sys.modules 和 blogs 包上暂时移除 tasks，观察 ready() 是否重新导入它
+        saved_module = sys.modules.pop('blogs.tasks', None)
+        saved_attr = blogs.__dict__.pop('tasks', None)
+
+        def restore():
+            if saved_module is not None:
+                sys.modules['blogs.tasks'] = saved_module
+            if saved_attr is not None:
+                blogs.tasks = saved_attr
+
+        self.addCleanup(restore)
+
+    def test_ready_imports_tasks(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop('DJANGO_SKIP_TASK_IMPORT', None)
+            apps.get_app_config('blogs').ready()
+        self.assertIn('blogs.tasks', sys.modules)
+        self.assertEqual(sys.modules['blogs.tasks'].aipdf.name, 'blogs.tasks.aipdf')
+
+    def test_ready_skips_tasks_when_flag_set(self):
+        with mock.patch.dict(os.environ, {'DJANGO_SKIP_TASK_IMPORT': '1'}):
+            apps.get_app_config('blogs').ready()
+        self.assertNotIn('blogs.tasks', sys.modules)
+
+
+if __name__ == '__main__':
+    # 手动调试翻译流程
+    from blogs.PDFMathTranslate.pdf2zh.api import aipdf
+
+    aipdf(r'D:\tmpShen\Desktop\IDKL.pdf', r'D:\tmpShen\Desktop')
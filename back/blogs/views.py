@@ -3,43 +3,68 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework import status
 from .serializers import UploadedFileSerializer
+import logging
 import os
 
 from django.http import FileResponse
 from pathlib import Path
 
-from .PDFMathTranslate.pdf2zh.high_level import translate, download_remote_fonts
-from .PDFMathTranslate.pdf2zh.doclayout import OnnxModel, ModelInstance
-from channels.layers import get_channel_layer
-
-import os
-from django.http import FileResponse
-from pathlib import Path
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
-import uuid
 from celery.result import AsyncResult
 from django.http import JsonResponse
+from django.http import HttpResponse
+from functools import lru_cache
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header
+from urllib.parse import quote
 
-from celery import shared_task
-from celery.result import AsyncResult
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
-import time
+# tasks 只在执行任务时才导入 pdf2zh，web 进程不会加载 ONNX 等翻译依赖
 from .tasks import aipdf
+# fsutils 只依赖标准库，web 进程导入它不会带上翻译依赖
+from .PDFMathTranslate.babeldoc.fsutils import ensure_dir
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=256)
+def resolve_translated_path(task_id):
+    # 任务完成后结果不会再变，缓存下来省去每次下载查询 Celery 结果后端；
+    # 未完成时抛异常，lru_cache 不会缓存异常，之后还会重新查询。
+    # aipdf 出错时会吞掉异常返回 None，状态仍是 SUCCESS，同样按未完成处理
+    task = AsyncResult(task_id)
+    if task.state != 'SUCCESS' or not task.result:
+        raise LookupError(task_id)
+    return task.result
 
 
 class FileDownloadView(APIView):
     def get(self, request, task_id):
-        task = AsyncResult(task_id)
-        if task.state != 'SUCCESS':
+        try:
+            translated_path = resolve_translated_path(task_id)
+        except LookupError:
             return JsonResponse({"error": "任务未完成"}, status=400)
 
-        translated_path = task.result
-        print(translated_path)
-        response = FileResponse(open(translated_path, 'rb'), content_type='application/octet-stream')
-        response['Content-Disposition'] = f'attachment; filename="{os.path.basename(translated_path)}"'
-        response['Content-Type'] = 'application/octet-stream'  # 通用二进制流类型
+        logger.debug('Serving %s for task %s', translated_path, task_id)
+        # 同一个任务的译文不会改变，浏览器可以直接用缓存
+        etag = f'"{task_id}"'
+        # 由 Django 解析 If-None-Match，弱校验标签、多个标签和 * 都能命中 304
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            response['ETag'] = etag
+            return response
+        filename = os.path.basename(translated_path)
+        accel_prefix = settings.DOWNLOAD_ACCEL_REDIRECT_PREFIX
+        if accel_prefix:
+            # 交给 nginx 的 internal location 发送文件，Django worker 立即释放
+            response = HttpResponse(content_type='application/octet-stream')
+            # 与 FileResponse 一样按 RFC 6266 编码文件名，中文或含引号的文件名也能正确下载
+            response['Content-Disposition'] = content_disposition_header(True, filename)
+            response['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{quote(filename)}"
+        else:
+            # 传入真实文件对象，服务器提供 wsgi.file_wrapper 时可以用 sendfile 零拷贝发送
+            response = FileResponse(open(translated_path, 'rb'), as_attachment=True, filename=filename,
+                                    content_type='application/octet-stream')  # 通用二进制流类型
+        response['Cache-Control'] = 'private, max-age=3600, immutable'
+        response['ETag'] = etag
         return response
 
 
@@ -57,7 +82,7 @@ class FileUploadView(APIView):  # APIView 是 DRF 提供的一个基础视图类
             # 处理文件
             from django.conf import settings
             save_path = Path(settings.BASE_DIR) / 'media' / 'blogs' / 'processed'  # Path 对象: 表示一个文件系统路径
-            save_path.mkdir(parents=True, exist_ok=True)  # parents=true自动创建路径中所有缺失的父目录 exist_ok=true当目标目录已存在时不会抛出错误
+            ensure_dir(save_path)
 
             # 启动异步任务
             task = aipdf.delay(file_path, str(save_path))
@@ -3,10 +3,20 @@
 import os
 import sys
 
+# 这些命令不会执行翻译任务，不需要在启动时加载 blogs.tasks
+SKIP_TASK_IMPORT_COMMANDS = {
+    "migrate",
+    "makemigrations",
+    "collectstatic",
+    "createsuperuser",
+}
+
 
 def main():
     """Run administrative tasks."""
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "back.settings")
+    if len(sys.argv) > 1 and sys.argv[1] in SKIP_TASK_IMPORT_COMMANDS:
+        os.environ.setdefault("DJANGO_SKIP_TASK_IMPORT", "1")
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc: